@@ -1,7 +1,8 @@
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, BackgroundTasks
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import time
 import uuid
 import asyncio
 from pathlib import Path
@@ -30,38 +31,67 @@ app.add_middleware(
 
 # Initialize voice cloner
 voice_cloner = None
+cleanup_task = None
+
+CLEANUP_INTERVAL = 300  # 5 minutes
+MAX_FILE_AGE = 3600  # 1 hour
+
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB in bytes
+UPLOAD_CHUNK_SIZE = 1 << 20  # 1MB
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize voice cloner on startup"""
-    global voice_cloner
+    global voice_cloner, cleanup_task
     logger.info("Initializing Voice Cloner...")
     voice_cloner = VoiceCloner()
+    voice_cloner.warmup()
 
     # Create directories
-    os.makedirs("uploads", exist_ok=True)
     os.makedirs("outputs", exist_ok=True)
 
+    cleanup_task = asyncio.create_task(cleanup_loop())
+
     logger.info("Voice Cloning API started successfully!")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background tasks and checkpoint voice metadata on shutdown"""
+    if cleanup_task:
+        cleanup_task.cancel()
+    if voice_cloner:
+        voice_cloner.save_voices_metadata()
+        voice_cloner.close()
+
+
 def cleanup_old_files():
     """Clean up old temporary files"""
-    import time
     current_time = time.time()
-    for folder in ["uploads", "outputs"]:
-        if os.path.exists(folder):
-            for file in os.listdir(folder):
-                file_path = os.path.join(folder, file)
-                if os.path.isfile(file_path):
+    for folder in ["outputs"]:
+        if not os.path.exists(folder):
+            continue
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                try:
                     # Delete files older than 1 hour
-                    if current_time - os.path.getctime(file_path) > 3600:
-                        try:
-                            os.remove(file_path)
-                            logger.info(f"Cleaned up old file: {file_path}")
-                        except:
-                            pass
+                    if entry.is_file() and current_time - entry.stat().st_ctime > MAX_FILE_AGE:
+                        os.remove(entry.path)
+                        logger.info(f"Cleaned up old file: {entry.path}")
+                except OSError:
+                    pass
+
+
+async def cleanup_loop():
+    """Periodically sweep temporary files off the event loop"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL)
+        try:
+            await loop.run_in_executor(None, cleanup_old_files)
+        except Exception as e:
+            logger.error(f"Error cleaning up old files: {str(e)}")
 
 
 @app.get("/")
@@ -92,7 +122,6 @@ async def health_check():
 
 @app.post("/clone-voice")
 async def clone_voice(
-    background_tasks: BackgroundTasks,
     audio_file: UploadFile = File(...),
     speaker_name: str = Form(...),
     overwrite: bool = Form(default=False)
@@ -112,32 +141,22 @@ async def clone_voice(
             detail=f"Speaker '{speaker_name}' already exists. Use overwrite=true to replace."
         )
 
-    # Validate file size (max 50MB)
-    max_size = 50 * 1024 * 1024  # 50MB in bytes
-    content = await audio_file.read()
-    if len(content) > max_size:
-        raise HTTPException(status_code=413, detail="File too large. Maximum size is 50MB")
-
-    # Save uploaded file
-    file_id = str(uuid.uuid4())
-    file_extension = os.path.splitext(audio_file.filename)[1] or '.wav'
-    file_path = f"uploads/{file_id}_{speaker_name}{file_extension}"
-
     try:
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
+        # Read the upload into memory in chunks, enforcing the size limit as we go (max 50MB)
+        content = bytearray()
+        while chunk := await audio_file.read(UPLOAD_CHUNK_SIZE):
+            content += chunk
+            if len(content) > MAX_UPLOAD_SIZE:
+                raise HTTPException(status_code=413, detail="File too large. Maximum size is 50MB")
 
         logger.info(f"Processing voice cloning for speaker: {speaker_name}")
 
-        # Create voice embedding
+        # Create voice embedding straight from the uploaded bytes
         success = await voice_cloner.create_voice_embedding(
-            audio_path=file_path,
+            audio_source=content,
             speaker_name=speaker_name
         )
 
-        # Schedule cleanup
-        background_tasks.add_task(cleanup_old_files)
-
         if success:
             logger.info(f"Successfully cloned voice: {speaker_name}")
             return {
@@ -148,21 +167,15 @@ async def clone_voice(
         else:
             raise HTTPException(status_code=500, detail="Voice cloning failed")
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error cloning voice: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Voice cloning failed: {str(e)}")
 
-    finally:
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except:
-                pass
-
 
 @app.post("/synthesize")
 async def synthesize_speech(
-    background_tasks: BackgroundTasks,
     text: str = Form(..., max_length=1000),
     speaker_name: str = Form(...),
     language: str = Form(default="en"),
@@ -191,15 +204,12 @@ async def synthesize_speech(
             speed=speed
         )
 
-        background_tasks.add_task(cleanup_old_files)
-
         download_filename = f"speech_{speaker_name}_{uuid.uuid4().hex[:8]}.wav"
 
         return FileResponse(
             output_file,
             media_type="audio/wav",
-            filename=download_filename,
-            headers={"Content-Disposition": f"attachment; filename={download_filename}"}
+            filename=download_filename
         )
 
     except Exception as e:
@@ -227,7 +237,7 @@ async def delete_speaker(speaker_name: str):
     if not voice_cloner:
         raise HTTPException(status_code=503, detail="Voice cloner not initialized")
 
-    success = voice_cloner.delete_speaker(speaker_name)
+    success = await voice_cloner.delete_speaker(speaker_name)
     if success:
         logger.info(f"Deleted speaker: {speaker_name}")
         return {"message": f"Speaker '{speaker_name}' deleted successfully"}
@@ -255,4 +265,4 @@ async def get_speaker_info(speaker_name: str):
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port, log_level="info")
+    uvicorn.run(app, host="0.0.0.0", port=port, http="httptools", log_level="info")
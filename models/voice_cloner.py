@@ -1,30 +1,84 @@
+import io
 import os
-import json
+import orjson
+import contextlib
 import uuid
 import torch
 import asyncio
+import hashlib
+import functools
 import logging
+import shutil
+import threading
+import tempfile
+import subprocess
 import numpy as np
 import torchaudio
-import librosa
 import soundfile as sf
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
 from TTS.api import TTS
+from TTS.tts.layers.xtts.tokenizer import split_sentence
 
 logger = logging.getLogger(__name__)
 
 
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over a bytes-like object. Unlike BytesIO it never copies the buffer."""
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(buffer).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        chunk = self._view[self._pos:self._pos + len(b)]
+        memoryview(b).cast("B")[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._pos = offset
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
 class VoiceCloner:
+    LATENT_CACHE_SIZE = 64
+    HASH_LOCK_STRIPES = 16
+    TOKEN_CACHE_SIZE = 256
+    # Silence appended after each sentence, as TTS's Synthesizer does
+    SENTENCE_PAUSE_SAMPLES = 10000
+
     def __init__(self):
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.dtype = torch.float16 if self.device == "cuda" else torch.float32
         logger.info(f"Initializing Voice Cloner on device: {self.device}")
 
         try:
             # Load Coqui XTTS model
             logger.info("Loading Coqui XTTS v2 model...")
             self.tts = TTS("tts_models/multilingual/multi-dataset/xtts_v2").to(self.device)
+            self.tts_model = self.tts.synthesizer.tts_model
+            if self.device == "cuda":
+                self.tts_model.half()
+            self.output_sample_rate = self.tts_model.config.audio.output_sample_rate
             logger.info("XTTS v2 model loaded successfully!")
         except Exception as e:
             logger.error(f"Failed to load XTTS model: {e}")
@@ -33,94 +87,230 @@ class VoiceCloner:
         # Storage for embeddings and metadata
         self.voices_dir = Path("voice_embeddings")
         self.voices_dir.mkdir(exist_ok=True)
+        # Reference clips and latents are stored once per distinct audio content
+        self.hash_dir = self.voices_dir / "by_hash"
+        self.hash_dir.mkdir(exist_ok=True)
         self.voice_metadata_file = self.voices_dir / "metadata.json"
         self.voices = self.load_voices_metadata()
         logger.info(f"Loaded {len(self.voices)} existing voice(s)")
+        self._meta_lock = asyncio.Lock()
+        # Serialize creating, reusing and releasing the shared files of each audio hash, striped
+        # by hash so the set stays fixed. Always taken before _meta_lock, never while holding it
+        self._hash_locks = [asyncio.Lock() for _ in range(self.HASH_LOCK_STRIPES)]
+
+        # Device-resident latents keyed by latents file, so speakers sharing audio share one copy.
+        # Most recently used last
+        self._latent_cache: "OrderedDict[str, Tuple[torch.Tensor, torch.Tensor]]" = OrderedDict()
+        self._latent_cache_lock = threading.Lock()
+
+        # Per-sentence token tensors keyed by (text, language), for repeated prompts
+        self._tokenize = functools.lru_cache(maxsize=self.TOKEN_CACHE_SIZE)(self._tokenize_uncached)
+
+        # Resample transforms keyed by (orig_freq, new_freq), reused to avoid rebuilding filter kernels
+        self._resamplers: Dict[Tuple[int, int], torchaudio.transforms.Resample] = {}
+
+        # XTTS calls are serialized on one thread so concurrent requests queue instead of
+        # contending for the GPU; audio decoding and file I/O get their own small pool
+        self._tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="xtts")
+        self._io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="audio-io")
+        self._tts_pending = 0
+
+        # SoX gives pitch-preserving speed changes; without it speed changes also shift pitch
+        self._sox_path = shutil.which("sox")
+        if not self._sox_path:
+            logger.warning("SoX not found; speed adjustments will change pitch")
 
     def load_voices_metadata(self) -> Dict:
+        voices = {}
+        checkpoint_mtime = 0.0
         if self.voice_metadata_file.exists():
             try:
-                with open(self.voice_metadata_file, 'r') as f:
-                    return json.load(f)
+                voices = orjson.loads(self.voice_metadata_file.read_bytes())
+                checkpoint_mtime = self.voice_metadata_file.stat().st_mtime
             except Exception as e:
                 logger.error(f"Error loading voice metadata: {e}")
-        return {}
+
+        # Per-speaker sidecars written since the last checkpoint take precedence
+        voice_dirs = set()
+        with os.scandir(self.voices_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir() or entry.name == self.hash_dir.name:
+                    continue
+                voice_dirs.add(entry.name)
+                if entry.name in voices and entry.stat().st_mtime <= checkpoint_mtime:
+                    continue
+                sidecar = Path(entry.path) / "meta.json"
+                if sidecar.exists():
+                    try:
+                        voices[entry.name] = orjson.loads(sidecar.read_bytes())
+                    except Exception as e:
+                        logger.error(f"Error loading metadata for {entry.name}: {e}")
+
+        # Voices deleted since the last checkpoint no longer have a directory
+        return {name: info for name, info in voices.items() if name in voice_dirs}
+
+    def _atomic_write(self, path: Path, data: bytes):
+        # Write to a temp file and swap it in so readers never see a partial file
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def save_voice_metadata(self, speaker_name: str):
+        """Persist a single speaker's metadata to its sidecar file."""
+        try:
+            self._atomic_write(
+                self.voices_dir / speaker_name / "meta.json",
+                orjson.dumps(self.voices[speaker_name], option=orjson.OPT_INDENT_2)
+            )
+        except Exception as e:
+            logger.error(f"Error saving metadata for {speaker_name}: {e}")
 
     def save_voices_metadata(self):
+        """Checkpoint all speakers into the combined metadata file."""
         try:
-            with open(self.voice_metadata_file, 'w') as f:
-                json.dump(self.voices, f, indent=2)
+            self._atomic_write(
+                self.voice_metadata_file,
+                orjson.dumps(self.voices, option=orjson.OPT_INDENT_2)
+            )
         except Exception as e:
             logger.error(f"Error saving voice metadata: {e}")
 
-    def preprocess_audio(self, audio_path: str, target_sr: int = 22050) -> str:
+    def _decode_audio(self, audio_source: Union[str, bytes, bytearray]) -> Tuple[np.ndarray, int]:
+        in_memory = isinstance(audio_source, (bytes, bytearray))
         try:
-            audio, sr = librosa.load(audio_path, sr=None)
-            audio, _ = librosa.effects.trim(audio, top_db=20)
-            audio = librosa.util.normalize(audio)
-
+            return sf.read(
+                _BufferReader(audio_source) if in_memory else audio_source,
+                dtype='float32',
+                always_2d=False
+            )
+        except RuntimeError:
+            pass
+
+        # libsndfile can't decode this container, fall back to audioread, which needs a real file.
+        # librosa is imported here only, as it pulls in numba and scipy at import time
+        import librosa
+
+        if in_memory:
+            with tempfile.NamedTemporaryFile() as tmp:
+                tmp.write(audio_source)
+                tmp.flush()
+                audio, sr = librosa.load(tmp.name, sr=None, mono=True)
+        else:
+            audio, sr = librosa.load(audio_source, sr=None, mono=True)
+        return audio.astype(np.float32, copy=False), sr
+
+    @staticmethod
+    def _trim_silence(audio: np.ndarray, top_db: float = 20, hop_length: int = 512) -> np.ndarray:
+        """Strip leading and trailing blocks more than ``top_db`` below the loudest block."""
+        if audio.size == 0:
+            return audio
+        starts = np.arange(0, len(audio), hop_length)
+        lengths = np.diff(np.append(starts, len(audio)))
+        power = np.add.reduceat(np.square(audio), starts) / lengths
+        ref = power.max()
+        if ref <= 0:
+            return audio
+        nonsilent = np.flatnonzero(power > ref * 10 ** (-top_db / 10))
+        start = nonsilent[0] * hop_length
+        end = min(len(audio), (nonsilent[-1] + 1) * hop_length)
+        return audio[start:end]
+
+    def preprocess_audio(
+        self, audio_source: Union[str, bytes, bytearray], target_sr: int = 22050
+    ) -> Tuple[torch.Tensor, int]:
+        """Decode, clean up and resample a clip in one pass, returning a (1, samples) waveform.
+
+        ``audio_source`` is either a file path or the raw bytes of an encoded audio file.
+        """
+        try:
+            audio, sr = self._decode_audio(audio_source)
+            if audio.ndim > 1:
+                audio = audio.mean(axis=1)
+
+            audio = self._trim_silence(audio, top_db=20)
+            if audio.size == 0:
+                raise ValueError("Audio contains no samples")
+            # Peak-normalize in place rather than allocating a normalized copy
+            peak = max(float(audio.max()), -float(audio.min()))
+            if peak > 0:
+                audio *= 1.0 / peak
+
+            waveform = torch.from_numpy(np.ascontiguousarray(audio, dtype=np.float32)).unsqueeze(0)
             if sr != target_sr:
-                audio = librosa.resample(audio, orig_sr=sr, target_sr=target_sr)
+                waveform = self._get_resampler(sr, target_sr)(waveform)
 
             min_length = target_sr * 3
             max_length = target_sr * 30
 
-            if len(audio) < min_length:
-                audio = np.tile(audio, int(np.ceil(min_length / len(audio))))[:min_length]
-            if len(audio) > max_length:
-                audio = audio[:max_length]
+            if waveform.shape[1] < min_length:
+                # np.resize tiles and truncates into a single float32 allocation
+                waveform = torch.from_numpy(np.resize(waveform[0].numpy(), min_length)).unsqueeze(0)
+            if waveform.shape[1] > max_length:
+                waveform = waveform[:, :max_length]
 
-            processed_path = audio_path.replace('.', '_processed.')
-            sf.write(processed_path, audio, target_sr)
-            return processed_path
+            return waveform, target_sr
         except Exception as e:
             logger.error(f"Error preprocessing audio: {e}")
-            return audio_path
+            raise
 
-    async def create_voice_embedding(self, audio_path: str, speaker_name: str) -> bool:
+    def _get_resampler(self, orig_freq: int, new_freq: int) -> torchaudio.transforms.Resample:
+        key = (orig_freq, new_freq)
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            resampler = torchaudio.transforms.Resample(orig_freq=orig_freq, new_freq=new_freq)
+            self._resamplers[key] = resampler
+        return resampler
+
+    async def create_voice_embedding(self, audio_source: Union[str, bytes, bytearray], speaker_name: str) -> bool:
+        if speaker_name == self.hash_dir.name:
+            logger.error(f"Speaker name '{speaker_name}' is reserved")
+            return False
         try:
-            processed_audio_path = self.preprocess_audio(audio_path)
-            voice_dir = self.voices_dir / speaker_name
-            voice_dir.mkdir(exist_ok=True)
-
-            reference_path = voice_dir / "reference.wav"
-            waveform, sample_rate = torchaudio.load(processed_audio_path)
-
-            if waveform.shape[0] > 1:
-                waveform = torch.mean(waveform, dim=0, keepdim=True)
-
-            if sample_rate != 22050:
-                resampler = torchaudio.transforms.Resample(orig_freq=sample_rate, new_freq=22050)
-                waveform = resampler(waveform)
-
-            torchaudio.save(reference_path, waveform, 22050)
-
-            test_text = "This is a test of the voice cloning system."
-            test_output = voice_dir / "test_sample.wav"
-
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.tts.tts_to_file(
-                    text=test_text,
-                    speaker_wav=str(reference_path),
-                    language="en",
-                    file_path=str(test_output)
-                )
+            loop = asyncio.get_running_loop()
+            waveform, sample_rate = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self.preprocess_audio(audio_source)
             )
-
-            self.voices[speaker_name] = {
-                "reference_path": str(reference_path),
-                "test_sample_path": str(test_output),
-                "created_at": str(uuid.uuid4()),
-                "sample_rate": 22050,
-                "audio_duration": float(waveform.shape[1] / 22050),
-                "status": "active"
-            }
-            self.save_voices_metadata()
-
-            if processed_audio_path != audio_path and os.path.exists(processed_audio_path):
-                os.remove(processed_audio_path)
+            audio_hash = hashlib.blake2b(waveform.numpy().tobytes(), digest_size=16).hexdigest()
+            reference_path = self.hash_dir / f"{audio_hash}.wav"
+            latents_path = self.hash_dir / f"{audio_hash}.pt"
+
+            async with self._get_hash_lock(audio_hash):
+                # Checked under the hash lock, so the shared files can't be released until this voice is registered
+                if not reference_path.exists():
+                    await loop.run_in_executor(
+                        self._io_executor,
+                        lambda: self._save_reference(reference_path, waveform, sample_rate)
+                    )
+
+                if latents_path.exists():
+                    logger.info(f"Reusing latents of identical reference audio for: {speaker_name}")
+                else:
+                    await self._run_model(lambda: self._compute_latents(str(reference_path), latents_path))
+
+                voice_dir = self.voices_dir / speaker_name
+                voice_dir.mkdir(exist_ok=True)
+
+                async with self._meta_lock:
+                    previous_voice = self.voices.get(speaker_name, {})
+                    previous_hash = previous_voice.get("audio_hash")
+                    self.voices[speaker_name] = {
+                        "reference_path": str(reference_path),
+                        "latents_path": str(latents_path),
+                        "audio_hash": audio_hash,
+                        "created_at": str(uuid.uuid4()),
+                        "sample_rate": sample_rate,
+                        "audio_duration": float(waveform.shape[1] / sample_rate),
+                        "status": "active"
+                    }
+                    self.save_voice_metadata(speaker_name)
+                    if previous_voice and not previous_hash:
+                        # Only now that the new metadata is visible can a cache miss not reload the old voice
+                        self._evict_latents(self._latents_path(speaker_name, previous_voice))
+
+            if previous_hash and previous_hash != audio_hash:
+                await self._release_audio_hash(previous_hash)
 
             logger.info(f"Successfully created voice embedding for: {speaker_name}")
             return True
@@ -128,30 +318,53 @@ class VoiceCloner:
             logger.error(f"Error creating voice embedding for {speaker_name}: {e}")
             return False
 
+    def _get_hash_lock(self, audio_hash: str) -> asyncio.Lock:
+        return self._hash_locks[int(audio_hash, 16) % len(self._hash_locks)]
+
+    def _save_reference(self, reference_path: Path, waveform: torch.Tensor, sample_rate: int):
+        # Write to a temp file and swap it in so the encoder never reads a partial clip
+        tmp_path = reference_path.with_suffix('.tmp.wav')
+        torchaudio.save(str(tmp_path), waveform, sample_rate)
+        os.replace(tmp_path, reference_path)
+
+    async def _release_audio_hash(self, audio_hash: str):
+        """Remove shared reference audio and latents once no speaker refers to them."""
+        async with self._get_hash_lock(audio_hash):
+            async with self._meta_lock:
+                if any(voice.get("audio_hash") == audio_hash for voice in self.voices.values()):
+                    return
+                self._evict_latents(self.hash_dir / f"{audio_hash}.pt")
+                for path in (self.hash_dir / f"{audio_hash}.wav", self.hash_dir / f"{audio_hash}.pt"):
+                    try:
+                        if path.exists():
+                            path.unlink()
+                    except OSError as e:
+                        logger.error(f"Error removing {path}: {e}")
+
     async def synthesize(self, text: str, speaker_name: str, language: str = "en", speed: float = 1.0) -> str:
         if speaker_name not in self.voices:
             raise ValueError(f"Speaker '{speaker_name}' not found")
 
-        reference_path = self.voices[speaker_name]["reference_path"]
         output_filename = f"output_{speaker_name}_{uuid.uuid4().hex[:8]}.wav"
         output_path = Path("outputs") / output_filename
         output_path.parent.mkdir(exist_ok=True)
 
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                None,
-                lambda: self.tts.tts_to_file(
-                    text=text,
-                    speaker_wav=reference_path,
-                    language=language,
-                    file_path=str(output_path),
-                    split_sentences=True
-                )
+            # Tokenize on the I/O pool so the model thread only runs GPU work
+            loop = asyncio.get_running_loop()
+            text_tokens = await loop.run_in_executor(
+                self._io_executor,
+                lambda: self._tokenize(text, language)
+            )
+            await self._run_model(
+                lambda: self._infer_to_file(text_tokens, speaker_name, str(output_path))
             )
 
             if speed != 1.0:
-                self._adjust_speed(str(output_path), speed)
+                await loop.run_in_executor(
+                    self._io_executor,
+                    lambda: self._adjust_speed(str(output_path), speed)
+                )
 
             logger.info(f"Successfully synthesized speech for {speaker_name}")
             return str(output_path)
@@ -159,13 +372,210 @@ class VoiceCloner:
             logger.error(f"Error synthesizing speech: {e}")
             raise
 
+    def close(self):
+        """Release executor threads."""
+        self._tts_executor.shutdown(wait=False)
+        self._io_executor.shutdown(wait=False)
+
+    async def _run_model(self, fn):
+        """Run a blocking XTTS call on the dedicated model thread."""
+        # Requests are not batched: XTTS v2 generates one text per call, and its GPT has no text
+        # attention mask, so padding several texts into one forward would change the output
+        self._tts_pending += 1
+        if self._tts_pending > 1:
+            logger.info(f"XTTS queue depth: {self._tts_pending}")
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._tts_executor, fn)
+        finally:
+            self._tts_pending -= 1
+
+    def _autocast(self):
+        if self.device == "cuda":
+            return torch.autocast("cuda", dtype=torch.float16)
+        return contextlib.nullcontext()
+
+    def _compute_latents(self, reference_path: str, latents_path: Path):
+        """Run the XTTS speaker encoder once and persist the conditioning tensors."""
+        with torch.inference_mode(), self._autocast():
+            # Same reference slicing and chunking that tts_to_file used via inference_with_config
+            config = self.tts_model.config
+            gpt_cond_latent, speaker_embedding = self.tts_model.get_conditioning_latents(
+                audio_path=reference_path,
+                gpt_cond_len=config.gpt_cond_len,
+                gpt_cond_chunk_len=config.gpt_cond_chunk_len,
+                max_ref_length=config.max_ref_len,
+                sound_norm_refs=config.sound_norm_refs
+            )
+        # Stored as float32 on CPU so the cache is independent of the serving device,
+        # via a temp file so a concurrent reader never loads a partial file
+        tmp_path = latents_path.with_suffix('.tmp')
+        torch.save(
+            {
+                "gpt_cond_latent": gpt_cond_latent.float().cpu(),
+                "speaker_embedding": speaker_embedding.float().cpu()
+            },
+            tmp_path
+        )
+        os.replace(tmp_path, latents_path)
+        return gpt_cond_latent, speaker_embedding
+
+    def _latents_path(self, speaker_name: str, voice: Dict) -> Path:
+        return Path(voice.get("latents_path") or self.voices_dir / speaker_name / "latents.pt")
+
+    def _load_latents(self, speaker_name: str, voice: Dict):
+        latents_path = self._latents_path(speaker_name, voice)
+        if not latents_path.exists():
+            # Voices cloned before latents were cached only have the reference clip
+            logger.info(f"Computing missing conditioning latents for: {speaker_name}")
+            return self._compute_latents(voice["reference_path"], latents_path)
+
+        latents = torch.load(latents_path, map_location="cpu")
+        return latents["gpt_cond_latent"], latents["speaker_embedding"]
+
+    def _get_latents(self, speaker_name: str) -> Tuple[torch.Tensor, torch.Tensor]:
+        voice = self.voices[speaker_name]
+        cache_key = str(self._latents_path(speaker_name, voice))
+        with self._latent_cache_lock:
+            if cache_key in self._latent_cache:
+                self._latent_cache.move_to_end(cache_key)
+                return self._latent_cache[cache_key]
+
+        gpt_cond_latent, speaker_embedding = self._load_latents(speaker_name, voice)
+        latents = (self._to_device(gpt_cond_latent, self.dtype), self._to_device(speaker_embedding, self.dtype))
+        with self._latent_cache_lock:
+            # Don't cache latents of a voice that was re-cloned or deleted while they loaded
+            if self.voices.get(speaker_name) is not voice:
+                return latents
+            self._latent_cache[cache_key] = latents
+            self._latent_cache.move_to_end(cache_key)
+            while len(self._latent_cache) > self.LATENT_CACHE_SIZE:
+                self._latent_cache.popitem(last=False)
+        return latents
+
+    def _evict_latents(self, latents_path: Path):
+        with self._latent_cache_lock:
+            self._latent_cache.pop(str(latents_path), None)
+
+    def _to_device(self, tensor: torch.Tensor, dtype: Optional[torch.dtype] = None) -> torch.Tensor:
+        # Pinned host memory lets the copy run asynchronously with queued GPU work
+        if self.device == "cuda" and not tensor.is_cuda:
+            tensor = tensor.pin_memory()
+        return tensor.to(self.device, dtype=dtype, non_blocking=True)
+
+    def _tokenize_uncached(self, text: str, language: str) -> Tuple[Tuple[torch.Tensor, ...], ...]:
+        """Split text into sentences the way tts_to_file() does and encode each one.
+
+        Sentences longer than the tokenizer's character limit are further split into chunks,
+        which are generated back to back without a pause.
+        """
+        if ("zh-cn" if language == "zh" else language) not in self.tts_model.config.languages:
+            raise ValueError(f"Language {language} is not supported")
+        language = language.split("-")[0]
+        tokenizer = self.tts_model.tokenizer
+        max_tokens = self.tts_model.args.gpt_max_text_tokens
+        text_tokens = []
+        for sentence in self.tts.synthesizer.split_into_sentences(text):
+            chunks = []
+            for chunk in split_sentence(sentence, language, tokenizer.char_limits[language]):
+                token_ids = tokenizer.encode(chunk.strip().lower(), lang=language)
+                if len(token_ids) >= max_tokens:
+                    raise ValueError(f"Sentence too long. XTTS can only generate up to {max_tokens} tokens per sentence")
+                tokens = torch.IntTensor(token_ids).unsqueeze(0)
+                if self.device == "cuda":
+                    tokens = tokens.pin_memory()
+                chunks.append(tokens)
+            text_tokens.append(tuple(chunks))
+        return tuple(text_tokens)
+
+    def _infer_to_file(self, text_tokens: Tuple[Tuple[torch.Tensor, ...], ...], speaker_name: str, output_path: str):
+        gpt_cond_latent, speaker_embedding = self._get_latents(speaker_name)
+        wav = self._generate(text_tokens, gpt_cond_latent, speaker_embedding)
+        # Peak-normalize to 16-bit PCM like TTS's save_wav, so loudness matches tts_to_file()
+        wav *= 32767 / max(0.01, float(np.max(np.abs(wav))))
+        sf.write(output_path, wav.astype(np.int16), self.output_sample_rate)
+
+    def _generate(
+        self,
+        text_tokens: Tuple[Tuple[torch.Tensor, ...], ...],
+        gpt_cond_latent: torch.Tensor,
+        speaker_embedding: torch.Tensor
+    ) -> np.ndarray:
+        config = self.tts_model.config
+        gpt = self.tts_model.gpt
+        pause = torch.zeros(self.SENTENCE_PAUSE_SAMPLES)
+        wavs = []
+        with torch.inference_mode(), self._autocast():
+            for sentence in text_tokens:
+                for tokens in sentence:
+                    tokens = self._to_device(tokens)
+                    gpt_codes = gpt.generate(
+                        cond_latents=gpt_cond_latent,
+                        text_inputs=tokens,
+                        input_tokens=None,
+                        do_sample=True,
+                        top_p=config.top_p,
+                        top_k=config.top_k,
+                        temperature=config.temperature,
+                        num_return_sequences=self.tts_model.gpt_batch_size,
+                        num_beams=1,
+                        length_penalty=config.length_penalty,
+                        repetition_penalty=config.repetition_penalty,
+                        output_attentions=False
+                    )
+                    expected_output_len = torch.tensor([gpt_codes.shape[-1] * gpt.code_stride_len], device=self.device)
+                    text_len = torch.tensor([tokens.shape[-1]], device=self.device)
+                    gpt_latents = gpt(
+                        tokens,
+                        text_len,
+                        gpt_codes,
+                        expected_output_len,
+                        cond_latents=gpt_cond_latent,
+                        return_attentions=False,
+                        return_latent=True
+                    )
+                    wav = self.tts_model.hifigan_decoder(gpt_latents, g=speaker_embedding)
+                    wavs.append(wav.float().cpu().squeeze())
+                wavs.append(pause)
+        return torch.cat(wavs, dim=0).numpy()
+
+    def warmup(self):
+        """Run one throwaway synthesis so CUDA init and lazy setup don't land on the first request."""
+        if self.device != "cuda":
+            # Nothing to compile on CPU, and a full generation would only delay startup
+            return
+        try:
+            logger.info("Warming up XTTS model...")
+            sample_rate = 22050
+            audio = torch.randn(1, sample_rate * 3, device=self.device) * 1e-3
+            with torch.inference_mode(), self._autocast():
+                gpt_cond_latent = self.tts_model.get_gpt_cond_latents(audio, sample_rate)
+                speaker_embedding = self.tts_model.get_speaker_embedding(audio, sample_rate)
+            self._generate(self._tokenize("Hello.", "en"), gpt_cond_latent, speaker_embedding)
+            logger.info("XTTS warmup complete")
+        except Exception as e:
+            logger.warning(f"XTTS warmup failed: {e}")
+
     def _adjust_speed(self, audio_path: str, speed: float):
+        tmp_path = audio_path.replace('.wav', '_tempo.wav')
         try:
-            audio, sr = librosa.load(audio_path)
-            audio_fast = librosa.effects.time_stretch(audio, rate=speed)
-            sf.write(audio_path, audio_fast, sr)
+            if self._sox_path:
+                # SoX's WSOLA tempo effect keeps pitch and runs in native code
+                subprocess.run(
+                    [self._sox_path, audio_path, tmp_path, "tempo", "-s", str(speed)],
+                    check=True,
+                    capture_output=True
+                )
+                os.replace(tmp_path, audio_path)
+            else:
+                logger.warning(f"SoX not available, adjusting speed by resampling (pitch shifts): {audio_path}")
+                audio, sr = sf.read(audio_path, dtype='float32')
+                sf.write(audio_path, audio, int(sr * speed))
         except Exception as e:
             logger.warning(f"Could not adjust speed: {e}")
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     def has_speaker(self, speaker_name: str) -> bool:
         return speaker_name in self.voices
@@ -183,21 +593,27 @@ class VoiceCloner:
             info["file_size_mb"] = round(os.path.getsize(reference_path) / (1024 * 1024), 2)
         return info
 
-    def delete_speaker(self, speaker_name: str) -> bool:
-        if speaker_name not in self.voices:
-            return False
-        try:
-            voice_dir = self.voices_dir / speaker_name
-            if voice_dir.exists():
-                import shutil
-                shutil.rmtree(voice_dir)
-            del self.voices[speaker_name]
-            self.save_voices_metadata()
-            logger.info(f"Successfully deleted speaker: {speaker_name}")
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting speaker {speaker_name}: {e}")
-            return False
+    async def delete_speaker(self, speaker_name: str) -> bool:
+        async with self._meta_lock:
+            if speaker_name not in self.voices:
+                return False
+            try:
+                voice_dir = self.voices_dir / speaker_name
+                if voice_dir.exists():
+                    shutil.rmtree(voice_dir)
+                voice = self.voices.pop(speaker_name)
+                audio_hash = voice.get("audio_hash")
+                if not audio_hash:
+                    self._evict_latents(self._latents_path(speaker_name, voice))
+            except Exception as e:
+                logger.error(f"Error deleting speaker {speaker_name}: {e}")
+                return False
+
+        # Released outside _meta_lock, as the hash lock must be taken first
+        if audio_hash:
+            await self._release_audio_hash(audio_hash)
+        logger.info(f"Successfully deleted speaker: {speaker_name}")
+        return True
 
     def get_model_info(self) -> Dict:
         return {